@@ -2,8 +2,15 @@ import tkinter as tk
 import time
 import math
 import random
+import os
+import queue
+import heapq
+import threading
+import statistics
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import PhotoImage
-from PIL import Image, ImageTk
+from PIL import Image, ImageDraw, ImageTk
 
 
 class SimplePy:
@@ -19,7 +26,6 @@ class SimplePy:
 
         self.running = False
         self.fps = fps
-        self.frame_time = 1.0 / fps
         self.sprites = []
         self.keys_pressed = set()
         self.mouse_x = 0
@@ -41,10 +47,25 @@ class SimplePy:
         self.on_start = None
         self.on_update = None
         self.on_draw = None
+        self.on_load_progress = None
+
+        self.assets = AssetLoader(self)
+        self.governor = FrameGovernor(self)
+        self.recorder = None
+        self._pen_lines_drawn = 0
+        self._pen_lines_list = None
 
         self.last_frame_time = time.time()
         self.frame_count = 0
 
+    @property
+    def frame_time(self):
+        return 1.0 / self.target_fps
+
+    @frame_time.setter
+    def frame_time(self, value):
+        self.target_fps = 1.0 / value
+
     def _on_key_press(self, event):
         self.keys_pressed.add(event.keysym.lower())
 
@@ -73,13 +94,21 @@ class SimplePy:
         self._game_loop()
         self.root.mainloop()
 
+        # Closing the window ends mainloop without quit(), so finish the
+        # recording here before the daemon encoder dies with the interpreter.
+        self.running = False
+        self.stop_recording()
+        self.assets.shutdown()
+
     def _game_loop(self):
         if not self.running:
             return
 
-        frame_start_time = time.time()
-        loops = 0
-        while time.time() - frame_start_time < self.frame_time and loops < self.max_frame_skip:
+        governor = self.governor
+        frame_start_time = governor.begin_frame()
+
+        skip_offscreen = governor.degraded("offscreen_sprites")
+        for _ in range(governor.updates_due()):
             if self.on_update and not self.is_frozen:
                 self.on_update()
 
@@ -87,43 +116,57 @@ class SimplePy:
                 for sprite in self.sprites:
                     sprite.update()
 
+                    if skip_offscreen and sprite.is_offscreen():
+                        continue
+
                     if (sprite.x < self.mouse_x < sprite.x + sprite.width and
                             sprite.y < self.mouse_y < sprite.y + sprite.height):
                         if sprite.on_hover:
                             sprite.on_hover()
-            loops += 1
+            governor.tick_count += 1
 
-        self.canvas.delete("all")
+        self.assets.process()
 
-        for line in self.pen_lines:
+        # When degraded, pen lines already on the canvas are kept and only new
+        # ones are drawn, instead of redrawing the whole trail every frame.
+        if (governor.degraded("pen_redraw") and self.pen_lines is self._pen_lines_list and
+                self._pen_lines_drawn <= len(self.pen_lines)):
+            self.canvas.delete("!pen")
+            new_pen_lines = self.pen_lines[self._pen_lines_drawn:]
+        else:
+            self.canvas.delete("all")
+            new_pen_lines = self.pen_lines
+
+        for line in new_pen_lines:
             self.canvas.create_line(
                 line["x1"], line["y1"],
                 line["x2"], line["y2"],
                 fill=line["color"],
-                width=line["width"]
+                width=line["width"],
+                tags="pen"
             )
+        self._pen_lines_drawn = len(self.pen_lines)
+        self._pen_lines_list = self.pen_lines
 
         self.sprites.sort(key=lambda sprite: sprite.layer)
 
         for sprite in self.sprites:
+            # Rotated sprites can reach past their box, so allow a margin.
+            if skip_offscreen and sprite.is_offscreen(max(sprite.width, sprite.height)):
+                continue
             sprite.draw(self.canvas)
 
         if self.on_draw:
             self.on_draw()
 
-        elapsed_time = time.time() - frame_start_time
-        sleep_time = max(0, self.frame_time - elapsed_time)
-        if self.fps_limit > 0:
-            sleep_time = min(sleep_time, 1.0 / self.fps_limit)
+        if self.recorder:
+            self.recorder.capture()
 
-        self.root.after(int(sleep_time * 1000), self._game_loop)
+        self.root.after(governor.end_frame(frame_start_time), self._game_loop)
 
         self.frame_count += 1
         current_time = time.time()
-        time_diff = current_time - self.last_frame_time
-
-        if time_diff >= 1.0:
-            self.current_fps = self.frame_count
+        if current_time - self.last_frame_time >= 1.0:
             self.frame_count = 0
             self.last_frame_time = current_time
 
@@ -132,13 +175,43 @@ class SimplePy:
 
     def quit(self):
         self.running = False
+        self.stop_recording()
+        self.assets.shutdown()
         self.root.destroy()
 
+    def preload(self, image_paths, width=None, height=None):
+        for image_path in image_paths:
+            self.assets.load(image_path, width, height)
+
+    def is_loading(self):
+        return self.assets.is_loading()
+
     def create_sprite(self, image_path=None, x=0, y=0, width=50, height=50, color="blue"):
         sprite = Sprite(self, image_path, x, y, width, height, color)
         self.sprites.append(sprite)
         return sprite
 
+    def start_recording(self, path, fps=30, scale=1.0, max_frames=None):
+        self.stop_recording()
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in (".gif", ".png"):
+            print(f"Error starting recording: unsupported format '{extension}', use .gif or .png")
+            return None
+        if fps <= 0 or scale <= 0:
+            print(f"Error starting recording: fps and scale must be positive, got fps={fps}, scale={scale}")
+            return None
+
+        self.recorder = Recorder(self, path, fps, scale, max_frames)
+        return self.recorder
+
+    def stop_recording(self):
+        if self.recorder:
+            self.recorder.stop()
+            self.recorder = None
+
+    def create_flow_field(self, cell_size=25):
+        return FlowField(self, cell_size)
+
     def check_collision(self, sprite1, sprite2):
         return (sprite1.x < sprite2.x + sprite2.width and
                 sprite1.x + sprite1.width > sprite2.x and
@@ -225,6 +298,695 @@ class SimplePy:
             self.pen_lines = []
 
 
+class FlowField:
+    STEPS = [
+        (1, 0, 1), (-1, 0, 1), (0, 1, 1), (0, -1, 1),
+        (1, 1, math.sqrt(2)), (1, -1, math.sqrt(2)), (-1, 1, math.sqrt(2)), (-1, -1, math.sqrt(2))
+    ]
+
+    def __init__(self, game, cell_size=25, cache_size=8):
+        self.game = game
+        self.cell_size = cell_size
+        self.cols = math.ceil(game.width / cell_size)
+        self.rows = math.ceil(game.height / cell_size)
+        self.blocked = [False] * (self.cols * self.rows)
+        self.distances = [math.inf] * (self.cols * self.rows)
+        self.next_cells = [-1] * (self.cols * self.rows)
+        self.directions = [None] * (self.cols * self.rows)
+        self.goal_cell = None
+        self.goal_x = None
+        self.goal_y = None
+        self.cache_size = cache_size
+        self._cache = {}
+        self.repair_limit = 0.25
+
+    def cell_at(self, x, y):
+        col = int(x // self.cell_size)
+        row = int(y // self.cell_size)
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            return row * self.cols + col
+        return None
+
+    def _adjacent(self, index):
+        col = index % self.cols
+        row = index // self.cols
+        for dc, dr, cost in self.STEPS:
+            c = col + dc
+            r = row + dr
+            if 0 <= c < self.cols and 0 <= r < self.rows:
+                yield r * self.cols + c, dc, dr, cost
+
+    def _neighbours(self, index):
+        col = index % self.cols
+        row = index // self.cols
+        for neighbour, dc, dr, cost in self._adjacent(index):
+            if self.blocked[neighbour]:
+                continue
+            # No cutting corners diagonally past a blocked cell.
+            if dc and dr and (self.blocked[row * self.cols + col + dc] or
+                              self.blocked[(row + dr) * self.cols + col]):
+                continue
+            yield neighbour, dc, dr, cost
+
+    def _propagate(self, heap):
+        changed = set()
+        while heap:
+            distance, index = heapq.heappop(heap)
+            if distance > self.distances[index]:
+                continue
+            changed.add(index)
+            for neighbour, dc, dr, cost in self._neighbours(index):
+                new_distance = distance + cost
+                if new_distance < self.distances[neighbour]:
+                    self.distances[neighbour] = new_distance
+                    heapq.heappush(heap, (new_distance, neighbour))
+        return changed
+
+    def _update_directions(self, cells):
+        for index in cells:
+            self.next_cells[index] = -1
+            self.directions[index] = None
+            if self.blocked[index] or index == self.goal_cell:
+                continue
+
+            best = math.inf
+            for neighbour, dc, dr, cost in self._neighbours(index):
+                if self.distances[neighbour] + cost < best and self.distances[neighbour] < self.distances[index]:
+                    best = self.distances[neighbour] + cost
+                    self.next_cells[index] = neighbour
+                    self.directions[index] = math.degrees(math.atan2(dr, dc))
+
+    def _compute(self):
+        size = self.cols * self.rows
+        self.distances = [math.inf] * size
+        self.next_cells = [-1] * size
+        self.directions = [None] * size
+        if self.goal_cell is None or self.blocked[self.goal_cell]:
+            return
+
+        self.distances[self.goal_cell] = 0
+        self._propagate([(0, self.goal_cell)])
+        self._update_directions(range(size))
+
+    def set_goal(self, x, y):
+        self.goal_x = x
+        self.goal_y = y
+        goal_cell = self.cell_at(x, y)
+        if goal_cell == self.goal_cell:
+            return
+
+        # Moving the goal shifts nearly every distance, so a goal cell that is
+        # not cached gets a full pass; only obstacle changes are incremental.
+        if self.goal_cell is not None:
+            self._cache[self.goal_cell] = (self.distances, self.next_cells, self.directions)
+            while len(self._cache) > self.cache_size:
+                del self._cache[next(iter(self._cache))]
+
+        self.goal_cell = goal_cell
+        if goal_cell in self._cache:
+            self.distances, self.next_cells, self.directions = self._cache.pop(goal_cell)
+        else:
+            self._compute()
+
+    def _cell_indices(self, cells):
+        indices = []
+        for col, row in cells:
+            if 0 <= col < self.cols and 0 <= row < self.rows:
+                indices.append(row * self.cols + col)
+        return indices
+
+    def block_cell(self, col, row):
+        self.block_cells([(col, row)])
+
+    def unblock_cell(self, col, row):
+        self.unblock_cells([(col, row)])
+
+    def block_cells(self, cells):
+        new_blocks = [index for index in self._cell_indices(cells) if not self.blocked[index]]
+        if not new_blocks:
+            return
+        for index in new_blocks:
+            self.blocked[index] = True
+        self._cache.clear()
+        if self.goal_cell is None:
+            return
+
+        # Only cells whose path ran through a new obstacle, or cut diagonally
+        # past one, need repair: start from those and collect everything whose
+        # path leads through them.
+        blocked = set(new_blocks)
+        pending = list(new_blocks)
+        for index in new_blocks:
+            for cell, dc, dr, cost in self._adjacent(index):
+                next_cell = self.next_cells[cell]
+                if next_cell < 0 or cell in blocked:
+                    continue
+                next_dc = next_cell % self.cols - cell % self.cols
+                next_dr = next_cell // self.cols - cell // self.cols
+                if next_dc and next_dr and index in (cell + next_dc, cell + next_dr * self.cols):
+                    pending.append(cell)
+
+        limit = self.repair_limit * len(self.blocked)
+        affected = set()
+        while pending:
+            cell = pending.pop()
+            if cell in affected:
+                continue
+            affected.add(cell)
+            if len(affected) > limit:
+                self._compute()
+                return
+            for neighbour, dc, dr, cost in self._adjacent(cell):
+                if neighbour not in affected and self.next_cells[neighbour] == cell:
+                    pending.append(neighbour)
+
+        for cell in affected:
+            self.distances[cell] = math.inf
+
+        heap = []
+        for cell in affected:
+            if self.blocked[cell]:
+                continue
+            if cell == self.goal_cell:
+                self.distances[cell] = 0
+            else:
+                for neighbour, dc, dr, cost in self._neighbours(cell):
+                    if neighbour not in affected:
+                        self.distances[cell] = min(self.distances[cell], self.distances[neighbour] + cost)
+            if self.distances[cell] < math.inf:
+                heapq.heappush(heap, (self.distances[cell], cell))
+
+        changed = self._propagate(heap) | affected
+        self._update_directions(self._with_adjacent(changed))
+
+    def unblock_cells(self, cells):
+        freed = [index for index in self._cell_indices(cells) if self.blocked[index]]
+        if not freed:
+            return
+        for index in freed:
+            self.blocked[index] = False
+        self._cache.clear()
+        if self.goal_cell is None:
+            return
+
+        # Freeing cells can only shorten paths, so relax from them and the
+        # neighbours whose diagonal moves they unblocked.
+        heap = []
+        for cell in self._with_adjacent(freed):
+            if self.blocked[cell]:
+                continue
+            best = 0 if cell == self.goal_cell else self.distances[cell]
+            for neighbour, dc, dr, cost in self._neighbours(cell):
+                best = min(best, self.distances[neighbour] + cost)
+            if best < self.distances[cell]:
+                self.distances[cell] = best
+            if self.distances[cell] < math.inf:
+                heapq.heappush(heap, (self.distances[cell], cell))
+
+        changed = self._propagate(heap)
+        changed.update(freed)
+        self._update_directions(self._with_adjacent(changed))
+
+    def _with_adjacent(self, cells):
+        result = set(cells)
+        for cell in cells:
+            result.update(neighbour for neighbour, dc, dr, cost in self._adjacent(cell))
+        return result
+
+    def _rect_cells(self, x, y, width, height, padding=0):
+        first_col = max(0, int((x - padding) // self.cell_size))
+        first_row = max(0, int((y - padding) // self.cell_size))
+        last_col = min(self.cols - 1, int(math.ceil((x + width + padding) / self.cell_size)) - 1)
+        last_row = min(self.rows - 1, int(math.ceil((y + height + padding) / self.cell_size)) - 1)
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                yield col, row
+
+    def block_rect(self, x, y, width, height, padding=0):
+        self.block_cells(self._rect_cells(x, y, width, height, padding))
+
+    def unblock_rect(self, x, y, width, height, padding=0):
+        self.unblock_cells(self._rect_cells(x, y, width, height, padding))
+
+    def block_sprite(self, sprite, padding=0):
+        self.block_rect(sprite.x, sprite.y, sprite.width, sprite.height, padding)
+
+    def unblock_sprite(self, sprite, padding=0):
+        self.unblock_rect(sprite.x, sprite.y, sprite.width, sprite.height, padding)
+
+    def set_grid(self, grid, solid=("#", 1)):
+        self.blocked = [False] * (self.cols * self.rows)
+        for row, tiles in enumerate(grid[:self.rows]):
+            for col, tile in enumerate(tiles[:self.cols]):
+                self.blocked[row * self.cols + col] = tile in solid
+        self._cache.clear()
+        self._compute()
+
+    def is_open(self, x, y):
+        index = self.cell_at(x, y)
+        return index is not None and not self.blocked[index]
+
+    def direction_at(self, x, y):
+        index = self.cell_at(x, y)
+        if index is None:
+            return None
+        return self.directions[index]
+
+    def distance_at(self, x, y):
+        index = self.cell_at(x, y)
+        if index is None:
+            return math.inf
+        return self.distances[index] * self.cell_size
+
+
+class FrameGovernor:
+    def __init__(self, game, window=120):
+        self.game = game
+        self.intervals = deque(maxlen=window)
+        self.work_times = deque(maxlen=window)
+        self.tick_count = 0
+        self.late_frames = 0
+        self.update_accumulator = 0.0
+        self.sleep_error = 0.0
+        self.last_frame_start = None
+        self.next_frame_start = None
+        self.wake_time = None
+
+        self.auto_quality = True
+        self.degradations = ["pen_redraw", "rotated_boxes", "offscreen_sprites"]
+        self.quality_level = 0
+        self.overload_threshold = 0.9
+        self.headroom_threshold = 0.5
+        self.overload_frames = 30
+        self.headroom_frames = 120
+        self._overloaded_count = 0
+        self._headroom_count = 0
+
+    def update_interval(self):
+        return 1.0 / self.game.target_fps
+
+    def frame_interval(self):
+        fps = self.game.target_fps
+        if self.game.fps_limit > 0:
+            fps = min(fps, self.game.fps_limit)
+        return 1.0 / fps
+
+    def begin_frame(self):
+        now = time.perf_counter()
+
+        if self.last_frame_start is None:
+            self.next_frame_start = now
+            self.update_accumulator = self.update_interval()
+        else:
+            interval = now - self.last_frame_start
+            self.intervals.append(interval)
+            self.update_accumulator += interval
+
+        # root.after() only takes whole milliseconds and usually wakes late, so
+        # learn the average oversleep and subtract it from the next delay.
+        if self.wake_time is not None:
+            frame_interval = self.frame_interval()
+            oversleep = max(-frame_interval, min(frame_interval, now - self.wake_time))
+            self.sleep_error += (oversleep - self.sleep_error) * 0.1
+            self.wake_time = None
+
+        self.last_frame_start = now
+        return now
+
+    def updates_due(self):
+        step = self.update_interval()
+        updates = int(self.update_accumulator / step + 0.25)
+        if updates > self.game.max_frame_skip:
+            # Too far behind to catch up; drop the backlog instead of spiralling.
+            updates = self.game.max_frame_skip
+            self.update_accumulator = 0.0
+        else:
+            self.update_accumulator -= updates * step
+        return updates
+
+    def end_frame(self, frame_start):
+        now = time.perf_counter()
+        interval = self.frame_interval()
+        work = now - frame_start
+        self.work_times.append(work)
+
+        if self.auto_quality:
+            self._adjust_quality(work, interval)
+
+        self.next_frame_start += interval
+        if now > self.next_frame_start:
+            self.late_frames += 1
+            if now - self.next_frame_start > interval:
+                self.next_frame_start = now
+
+        delay = self.next_frame_start - now - self.sleep_error
+        if delay > 0:
+            delay_ms = int(round(delay * 1000))
+            self.wake_time = now + delay_ms / 1000
+        else:
+            delay_ms = 0
+
+        if self.intervals:
+            recent = list(self.intervals)[-30:]
+            self.game.current_fps = round(len(recent) / sum(recent))
+
+        return delay_ms
+
+    def _adjust_quality(self, work, interval):
+        last_interval = self.intervals[-1] if self.intervals else interval
+
+        if work > interval * self.overload_threshold or last_interval > interval * 1.25:
+            self._overloaded_count += 1
+            self._headroom_count = 0
+        elif work < interval * self.headroom_threshold and last_interval <= interval * 1.1:
+            self._headroom_count += 1
+            self._overloaded_count = 0
+        else:
+            self._overloaded_count = 0
+            self._headroom_count = 0
+
+        if self._overloaded_count >= self.overload_frames and self.quality_level < len(self.degradations):
+            self.set_quality_level(self.quality_level + 1)
+        elif self._headroom_count >= self.headroom_frames and self.quality_level > 0:
+            self.set_quality_level(self.quality_level - 1)
+
+    def set_quality_level(self, level):
+        self.quality_level = max(0, min(level, len(self.degradations)))
+        self._overloaded_count = 0
+        self._headroom_count = 0
+
+    def degraded(self, name):
+        return name in self.degradations[:self.quality_level]
+
+    def stats(self):
+        intervals = list(self.intervals)
+        work_times = list(self.work_times)
+        if not intervals:
+            intervals = [0.0]
+        if not work_times:
+            work_times = [0.0]
+
+        return {
+            "fps": self.game.current_fps,
+            "frame_ms": statistics.mean(intervals) * 1000,
+            "jitter_ms": statistics.pstdev(intervals) * 1000,
+            "worst_ms": max(intervals) * 1000,
+            "work_ms": statistics.mean(work_times) * 1000,
+            "late_frames": self.late_frames,
+            "quality_level": self.quality_level,
+            "degraded": self.degradations[:self.quality_level]
+        }
+
+
+class AssetLoader:
+    def __init__(self, game, max_workers=4, cache_size=64, source_cache_size=32):
+        self.game = game
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="SimplePyAssets")
+        self.ready = queue.Queue()
+        self.lock = threading.Lock()
+        self.cache = {}
+        self.cache_size = cache_size
+        self.sources = {}
+        self.source_cache_size = source_cache_size
+        self.pending = {}
+        self.total = 0
+        self.loaded = 0
+        self.frame_budget = 0.004
+
+    def _source(self, image_path):
+        # Decoded files are shared between sizes, so a preload or a resize
+        # only has to scale, not open the file again.
+        with self.lock:
+            if image_path in self.sources:
+                self.sources[image_path] = self.sources.pop(image_path)
+                return self.sources[image_path]
+
+        pil_image = Image.open(image_path)
+        pil_image.load()
+
+        with self.lock:
+            self.sources[image_path] = pil_image
+            while len(self.sources) > self.source_cache_size:
+                del self.sources[next(iter(self.sources))]
+        return pil_image
+
+    def _decode(self, image_path, width, height):
+        pil_image = self._source(image_path)
+        if width and height:
+            pil_image = pil_image.resize((int(width), int(height)), Image.LANCZOS)
+        return pil_image
+
+    def _cached(self, key):
+        if key not in self.cache:
+            return None
+        self.cache[key] = self.cache.pop(key)
+        return self.cache[key]
+
+    def _store(self, key, image_object):
+        self.cache[key] = image_object
+        while len(self.cache) > self.cache_size:
+            del self.cache[next(iter(self.cache))]
+
+    def load(self, image_path, width=None, height=None, callback=None, wanted=None):
+        key = (image_path, width, height)
+
+        image_object = self._cached(key)
+        if image_object:
+            if callback:
+                callback(image_object)
+            return
+
+        # Requests without a callback come from preload() and always want
+        # the result.
+        if key in self.pending:
+            self.pending[key].append((callback, wanted))
+            return
+
+        # Progress starts over with the first request after everything has
+        # loaded, so each loading screen reports its own batch.
+        if not self.is_loading():
+            self.total = 0
+            self.loaded = 0
+
+        self.pending[key] = [(callback, wanted)]
+        self.total += 1
+        future = self.executor.submit(self._decode, image_path, width, height)
+        future.add_done_callback(lambda done: self.ready.put((key, done)))
+
+    def load_now(self, image_path, width=None, height=None):
+        key = (image_path, width, height)
+        image_object = self._cached(key)
+        if not image_object:
+            image_object = ImageTk.PhotoImage(self._decode(image_path, width, height))
+            self._store(key, image_object)
+        return image_object
+
+    def process(self):
+        # PhotoImage must be created on the Tk thread, so finished decodes are
+        # turned into images here, a few at a time, within the frame budget.
+        deadline = time.perf_counter() + self.frame_budget
+        while True:
+            try:
+                key, future = self.ready.get_nowait()
+            except queue.Empty:
+                break
+
+            requests = [
+                callback for callback, wanted in self.pending.pop(key, [])
+                if wanted is None or wanted()
+            ]
+            callbacks = [callback for callback in requests if callback]
+            image_path, width, height = key
+            try:
+                pil_image = future.result()
+                # Skip the PhotoImage when no sprite still wants this size, or
+                # for an unsized preload that only warms the source cache.
+                if callbacks or (requests and width and height):
+                    image_object = ImageTk.PhotoImage(pil_image)
+                    self._store(key, image_object)
+                else:
+                    image_object = None
+            except Exception as e:
+                print(f"Error loading image: {e}")
+                image_object = None
+
+            self.loaded += 1
+            for callback in callbacks:
+                callback(image_object)
+
+            if self.game.on_load_progress:
+                self.game.on_load_progress(self.loaded, self.total)
+
+            if time.perf_counter() >= deadline:
+                break
+
+    def is_loading(self):
+        return self.loaded < self.total
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class Recorder:
+    def __init__(self, game, path, fps=30, scale=1.0, max_frames=None, max_queue=8):
+        self.game = game
+        self.path = path
+        self.fps = fps
+        self.scale = scale
+        self.is_gif = path.lower().endswith(".gif")
+        # A GIF is only written when recording stops, so every frame is held in
+        # memory until then (about 480 KB per 800x600 frame). GIFs are capped;
+        # use a .png sequence for long recordings.
+        if max_frames is None and self.is_gif:
+            max_frames = 600
+        self.max_frames = max_frames
+        self.limit_reached = False
+        self.frames = queue.Queue(maxsize=max_queue)
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.next_capture_time = time.perf_counter()
+        self._colors = {}
+        self._pen_lines_sent = 0
+        self._pen_lines = None
+
+        self.worker = threading.Thread(target=self._encode, name="SimplePyRecorder", daemon=True)
+        self.worker.start()
+
+    def _rgb(self, color):
+        # Tk knows more color names than PIL, so let Tk resolve them once.
+        if color not in self._colors:
+            try:
+                r, g, b = self.game.root.winfo_rgb(color)
+                self._colors[color] = (r >> 8, g >> 8, b >> 8)
+            except tk.TclError:
+                self._colors[color] = (0, 0, 0)
+        return self._colors[color]
+
+    def capture(self):
+        now = time.perf_counter()
+        if now < self.next_capture_time:
+            return
+        if self.max_frames is not None and self.frames_captured >= self.max_frames:
+            if not self.limit_reached:
+                print(f"Recording reached its limit of {self.max_frames} frames")
+                self.limit_reached = True
+            return
+        self.next_capture_time = max(self.next_capture_time + 1.0 / self.fps, now)
+
+        # Only a cheap snapshot of the scene is taken here; rasterizing and
+        # encoding happen on the worker thread.
+        pen_lines = self.game.pen_lines
+        reset_pen = pen_lines is not self._pen_lines or len(pen_lines) < self._pen_lines_sent
+        start = 0 if reset_pen else self._pen_lines_sent
+        new_lines = [
+            (line["x1"], line["y1"], line["x2"], line["y2"], self._rgb(line["color"]), line["width"])
+            for line in pen_lines[start:]
+        ]
+
+        shapes = []
+        for sprite in self.game.sprites:
+            if not sprite.visible:
+                continue
+            if sprite.image_object and sprite.image_key:
+                shapes.append(("image", (sprite.x, sprite.y), sprite.image_key))
+            else:
+                kind, points = sprite._shape(full_quality=True)
+                shapes.append((kind, points, self._rgb(sprite.color)))
+
+        try:
+            self.frames.put_nowait((now, reset_pen, new_lines, shapes))
+        except queue.Full:
+            self.frames_dropped += 1
+            return
+
+        self._pen_lines = pen_lines
+        self._pen_lines_sent = len(pen_lines)
+        self.frames_captured += 1
+
+    def _encode(self):
+        size = (max(1, round(self.game.width * self.scale)), max(1, round(self.game.height * self.scale)))
+        pen_layer = Image.new("RGB", size, "white")
+        pen_draw = ImageDraw.Draw(pen_layer)
+        scaled_images = {}
+        gif_frames = []
+        timestamps = []
+        index = 0
+
+        while True:
+            frame = self.frames.get()
+            if frame is None:
+                break
+            timestamp, reset_pen, new_lines, shapes = frame
+
+            if reset_pen:
+                pen_layer = Image.new("RGB", size, "white")
+                pen_draw = ImageDraw.Draw(pen_layer)
+            for x1, y1, x2, y2, color, width in new_lines:
+                pen_draw.line(
+                    [x1 * self.scale, y1 * self.scale, x2 * self.scale, y2 * self.scale],
+                    fill=color, width=max(1, round(width * self.scale))
+                )
+
+            image = pen_layer.copy()
+            draw = ImageDraw.Draw(image)
+            for kind, points, value in shapes:
+                points = [point * self.scale for point in points]
+                if kind == "image":
+                    # Images are decoded again here from their asset key, so
+                    # the loader never has to keep PIL copies around.
+                    if value not in scaled_images:
+                        try:
+                            scaled = self.game.assets._decode(*value).convert("RGBA")
+                            if self.scale != 1:
+                                scaled = scaled.resize(
+                                    (max(1, round(scaled.width * self.scale)), max(1, round(scaled.height * self.scale))),
+                                    Image.LANCZOS
+                                )
+                        except Exception as e:
+                            print(f"Error recording image: {e}")
+                            scaled = None
+                        scaled_images[value] = scaled
+                    scaled = scaled_images[value]
+                    if scaled:
+                        image.paste(scaled, (round(points[0]), round(points[1])), scaled)
+                elif kind == "polygon":
+                    draw.polygon(points, fill=value, outline=value)
+                else:
+                    draw.rectangle(points, fill=value, outline=value)
+
+            try:
+                if self.is_gif:
+                    gif_frames.append(image.convert("P", palette=Image.ADAPTIVE))
+                    timestamps.append(timestamp)
+                else:
+                    root = os.path.splitext(self.path)[0]
+                    image.save(f"{root}_{index:05d}.png")
+            except Exception as e:
+                print(f"Error recording frame: {e}")
+            index += 1
+
+        if gif_frames:
+            # Each frame lasts until the next one was captured, so slow or
+            # dropped frames keep real time instead of speeding up playback.
+            durations = [
+                max(10, round((end - start) * 1000))
+                for start, end in zip(timestamps, timestamps[1:])
+            ]
+            durations.append(round(1000 / self.fps))
+            try:
+                gif_frames[0].save(
+                    self.path, save_all=True, append_images=gif_frames[1:],
+                    duration=durations, loop=0
+                )
+            except Exception as e:
+                print(f"Error saving recording: {e}")
+
+    def stop(self):
+        if self.worker.is_alive():
+            self.frames.put(None)
+            self.worker.join()
+
+
 class Sprite:
     def __init__(self, game, image_path=None, x=0, y=0, width=50, height=50, color="blue"):
         self.game = game
@@ -238,6 +1000,7 @@ class Sprite:
         self.speed = 0
         self.image = None
         self.image_object = None
+        self.image_key = None
         self.rotate_visual = False
 
         self.anchor = "center"
@@ -267,16 +1030,41 @@ class Sprite:
     def set_layer(self, layer):
         self.layer = layer
 
-    def set_image(self, image_path):
-        try:
-            pil_image = Image.open(image_path)
-            pil_image = pil_image.resize((self.width, self.height), Image.LANCZOS)
-            self.image_object = ImageTk.PhotoImage(pil_image)
-            self.image = image_path
-        except Exception as e:
-            print(f"Error loading image: {e}")
+    def set_image(self, image_path, wait=False):
+        if wait:
+            try:
+                self.image_object = self.game.assets.load_now(image_path, self.width, self.height)
+                self.image_key = (image_path, self.width, self.height)
+                self.image = image_path
+            except Exception as e:
+                print(f"Error loading image: {e}")
+                self.image = None
+                self.image_object = None
+                self.image_key = None
+            return
+
+        # The color rectangle is drawn as a placeholder until the first image is
+        # ready; after that the current image stays up until its replacement is.
+        self.image = image_path
+        width = self.width
+        height = self.height
+        self.game.assets.load(
+            image_path, width, height,
+            lambda image_object: self._on_image_loaded(image_path, width, height, image_object),
+            lambda: (self.image, self.width, self.height) == (image_path, width, height)
+        )
+
+    def _on_image_loaded(self, image_path, width, height, image_object):
+        if (self.image, self.width, self.height) != (image_path, width, height):
+            return
+
+        if image_object:
+            self.image_object = image_object
+            self.image_key = (image_path, width, height)
+        else:
             self.image = None
             self.image_object = None
+            self.image_key = None
 
     def set_anchor(self, anchor):
         if isinstance(anchor, (list, tuple)) and len(anchor) == 2:
@@ -363,35 +1151,38 @@ class Sprite:
         if self.image_object:
             canvas.create_image(self.x, self.y, image=self.image_object, anchor="nw")
         else:
-            if self.rotate_visual:
-                anchor_absolute_x = self.x + self.anchor_x_offset
-                anchor_absolute_y = self.y + self.anchor_y_offset
+            kind, points = self._shape()
+            if kind == "polygon":
+                canvas.create_polygon(points, fill=self.color, outline=self.color)
+            else:
+                canvas.create_rectangle(points, fill=self.color, outline=self.color)
 
-                angle_rad = math.radians(self.direction)
-                cos_val = math.cos(angle_rad)
-                sin_val = math.sin(angle_rad)
+    def _shape(self, full_quality=False):
+        if self.rotate_visual and (full_quality or not self.game.governor.degraded("rotated_boxes")):
+            anchor_absolute_x = self.x + self.anchor_x_offset
+            anchor_absolute_y = self.y + self.anchor_y_offset
 
-                corners = [
-                    (-self.anchor_x_offset, -self.anchor_y_offset),
-                    (self.width - self.anchor_x_offset, -self.anchor_y_offset),
-                    (self.width - self.anchor_x_offset, self.height - self.anchor_y_offset),
-                    (-self.anchor_x_offset, self.height - self.anchor_y_offset)
-                ]
+            angle_rad = math.radians(self.direction)
+            cos_val = math.cos(angle_rad)
+            sin_val = math.sin(angle_rad)
 
-                points = []
-                for corner_x, corner_y in corners:
-                    rotated_x = corner_x * cos_val - corner_y * sin_val
-                    rotated_y = corner_x * sin_val + corner_y * cos_val
+            corners = [
+                (-self.anchor_x_offset, -self.anchor_y_offset),
+                (self.width - self.anchor_x_offset, -self.anchor_y_offset),
+                (self.width - self.anchor_x_offset, self.height - self.anchor_y_offset),
+                (-self.anchor_x_offset, self.height - self.anchor_y_offset)
+            ]
 
-                    points.extend([anchor_absolute_x + rotated_x, anchor_absolute_y + rotated_y])
+            points = []
+            for corner_x, corner_y in corners:
+                rotated_x = corner_x * cos_val - corner_y * sin_val
+                rotated_y = corner_x * sin_val + corner_y * cos_val
 
-                canvas.create_polygon(points, fill=self.color, outline=self.color)
-            else:
-                canvas.create_rectangle(
-                    self.x, self.y,
-                    self.x + self.width, self.y + self.height,
-                    fill=self.color, outline=self.color
-                )
+                points.extend([anchor_absolute_x + rotated_x, anchor_absolute_y + rotated_y])
+
+            return "polygon", points
+
+        return "rectangle", [self.x, self.y, self.x + self.width, self.y + self.height]
 
     def move(self, x, y):
         if self.pen_active:
@@ -466,6 +1257,30 @@ class Sprite:
             self.last_pen_x = new_x
             self.last_pen_y = new_y
 
+    def follow_flow_field(self, field, speed, rotate_visual=False):
+        anchor_absolute_x = self.x + self.anchor_x_offset
+        anchor_absolute_y = self.y + self.anchor_y_offset
+
+        direction = field.direction_at(anchor_absolute_x, anchor_absolute_y)
+        cell = field.cell_at(anchor_absolute_x, anchor_absolute_y)
+
+        # In the goal cell, or anywhere the field has no direction (off the
+        # grid, inside an obstacle, cut off), head straight for the goal.
+        if direction is None or cell == field.goal_cell:
+            if field.goal_x is None:
+                return False
+            distance = math.hypot(field.goal_x - anchor_absolute_x, field.goal_y - anchor_absolute_y)
+            if distance == 0:
+                return False
+            self.point_towards(field.goal_x, field.goal_y, rotate_visual)
+            self.move_forward(min(speed, distance))
+            return True
+
+        self.direction = direction
+        self.rotate_visual = rotate_visual
+        self.move_forward(speed)
+        return True
+
     def turn(self, angle):
         self.direction += angle
 
@@ -527,6 +1342,12 @@ class Sprite:
                 self.x + self.width >= self.game.width or
                 self.y + self.height >= self.game.height)
 
+    def is_offscreen(self, margin=0):
+        return (self.x + self.width + margin < 0 or
+                self.y + self.height + margin < 0 or
+                self.x - margin > self.game.width or
+                self.y - margin > self.game.height)
+
     def on_hover(self):
         if self.x < self.game.mouse_x < self.x + self.width and self.y < self.game.mouse_y < self.y + self.height:
             return True
@@ -611,17 +1432,17 @@ if __name__ == "__main__":
 
     def update():
         if game.is_key_pressed("left"):
-            player.move(-5, 0)
+            player.move(-25, 0)
         if game.is_key_pressed("right"):
-            player.move(5, 0)
+            player.move(25, 0)
         if game.is_key_pressed("up"):
-            player.move(0, -5)
+            player.move(0, -25)
         if game.is_key_pressed("down"):
-            player.move(0, 5)
+            player.move(0, 25)
 
         if game.mouse_pressed:
             player.point_towards(game.mouse_x, game.mouse_y)
-            player.speed = 3
+            player.speed = 15
         else:
             player.speed = 0
 
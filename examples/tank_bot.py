@@ -7,6 +7,7 @@ game = SimplePy(title="Test", width=500, height=500, fps=60)
 enemy = game.create_sprite(x=400, y=300, width=50, height=50, color="red")
 player = game.create_sprite(x=game.width / 2, y=game.height / 2, width=50, height=50, color="blue")
 gun = game.create_sprite(x=100, y=100, width=50, height=10, color="green")
+wall = game.create_sprite(x=200, y=100, width=25, height=200, color="gray")
 
 enemy.set_anchor("center")
 player.set_anchor("center")
@@ -14,6 +15,9 @@ gun.set_anchor("left")
 
 gun.set_layer(3)
 
+field = game.create_flow_field(cell_size=25)
+field.block_sprite(wall, padding=25)
+
 score = 0
 PLAYER_SAFE_DISTANCE = 150
 MAX_BULLETS = 50
@@ -37,14 +41,14 @@ def create_bullet():
             bullet.x = gun.x
             bullet.y = gun.y
             bullet.direction = gun.direction
-            bullet.speed = 10 / 2
+            bullet.speed = 50 / 2
             bullet.active = True
             bullets.append(bullet)
             return
 
 def update():
-    enemy.point_towards(gun.x, gun.y, True)
-    enemy.move_forward(5 / 2)
+    field.set_goal(gun.x, gun.y)
+    enemy.follow_flow_field(field, 25 / 2, True)
 
     gun.move_to(player.x + 25, player.y + 20)
     enemy_center_x = enemy.x + enemy.width / 2
@@ -52,7 +56,7 @@ def update():
     gun.turn_towards(enemy_center_x, enemy_center_y, 100, True)
     player.turn_towards(enemy_center_x, enemy_center_y, 100, True)
 
-    player.move_forward(10 / 2)
+    player.move_forward(50 / 2)
 
     if game.check_collision(player, enemy):
         if game.distance(player.x, player.y, enemy.x, enemy.y) < player.width * 0.8:
@@ -71,8 +75,10 @@ def update():
             bullet.active = False
             bullets.remove(bullet)
             while True:
-                enemy.x = game.random_number(0, game.width)
-                enemy.y = game.random_number(0, game.height)
+                enemy.x = game.random_number(0, game.width - enemy.width)
+                enemy.y = game.random_number(0, game.height - enemy.height)
+                if not field.is_open(enemy.x + enemy.anchor_x_offset, enemy.y + enemy.anchor_y_offset):
+                    continue
                 if game.distance(enemy.x, enemy.y, player.x, player.y) > PLAYER_SAFE_DISTANCE:
                     break
 